@@ -25,55 +25,86 @@
 const fs = require("fs");
 const path = require("path");
 
-// Load prompt JSON files
-const SYSTEM_PROMPT = JSON.parse(
-  fs.readFileSync(path.join(__dirname, "../prompts/system_prompt.json"), "utf8")
-);
-const TIER_PROMPTS = JSON.parse(
-  fs.readFileSync(path.join(__dirname, "../prompts/tier_prompts.json"), "utf8")
-);
-const MODE_PROMPTS = JSON.parse(
-  fs.readFileSync(path.join(__dirname, "../prompts/mode_prompts.json"), "utf8")
-);
+// Prompt JSON files are read on first use rather than at require time, so
+// importers that never assemble a text prompt (e.g. vision-only callers)
+// skip the disk I/O. Joined text is computed in the same pass and cached.
+const readPromptJson = (file) =>
+  JSON.parse(fs.readFileSync(path.join(__dirname, "../prompts", file), "utf8"));
+const joinPromptContents = (prompts) =>
+  Object.fromEntries(
+    Object.entries(prompts).map(([key, prompt]) => [
+      key,
+      ((prompt && prompt.content) || []).join("\n")
+    ])
+  );
+
+let PROMPTS = null;
+function loadPrompts() {
+  if (PROMPTS) return PROMPTS;
+
+  const system = readPromptJson("system_prompt.json");
+  const tiers = readPromptJson("tier_prompts.json");
+  const modes = readPromptJson("mode_prompts.json");
+
+  PROMPTS = {
+    system,
+    tiers,
+    modes,
+    systemText: (system.content || []).join("\n"),
+    tierText: joinPromptContents(tiers),
+    modeText: joinPromptContents(modes)
+  };
+  return PROMPTS;
+}
+
+// Allowed assemblePrompt() inputs (Sets for lookup, joined once for errors)
+const VALID_TIERS = new Set(["warmup", "standard", "challenge", "contest", "elite"]);
+const VALID_MODES = new Set(["bootcamp", "mixed", "mock"]);
+const VALID_STATES = new Set(["active", "submitted", "review"]);
+const VALID_TIERS_MSG = [...VALID_TIERS].join(", ");
+const VALID_MODES_MSG = [...VALID_MODES].join(", ");
+const VALID_STATES_MSG = [...VALID_STATES].join(", ");
 
 // Response templates (strict output formats)
 // We try to load: ai/prompts/response_templates.json
 // If missing, we use safe defaults so your app doesn't crash.
+// Loaded on first use, like the prompt files above.
 let RESPONSE_TEMPLATES = null;
-try {
-  RESPONSE_TEMPLATES = JSON.parse(
-    fs.readFileSync(
-      path.join(__dirname, "../prompts/response_templates.json"),
-      "utf8"
-    )
-  );
-} catch (e) {
-  RESPONSE_TEMPLATES = {
-    active_v1: [
-      "OUTPUT RULES (ACTIVE ATTEMPT):",
-      "- DO NOT reveal the final answer or full solution.",
-      "- DO NOT use phrases like 'final answer', 'answer is', or show computed results.",
-      "- Ask ONE focused question OR give ONE small hint.",
-      "- Keep it short (max ~80 words).",
-      "- Do not provide step-by-step solution."
-    ],
-    submitted_v1: [
-      "OUTPUT RULES (SUBMITTED):",
-      "- Student has submitted, but this is not review yet.",
-      "- Acknowledge submission briefly.",
-      "- Ask if they want review mode.",
-      "- Do NOT reveal the final answer or full solution."
-    ],
-    review_v1: [
-      "OUTPUT RULES (REVIEW MODE):",
-      "- Student already submitted; provide full solution clearly.",
-      "- Include final answer and explain reasoning.",
-      "- Use steps if helpful.",
-      "- Be crisp and correct."
-    ]
-  };
+function loadResponseTemplates() {
+  if (RESPONSE_TEMPLATES) return RESPONSE_TEMPLATES;
+  try {
+    RESPONSE_TEMPLATES = readPromptJson("response_templates.json");
+  } catch (e) {
+    RESPONSE_TEMPLATES = DEFAULT_RESPONSE_TEMPLATES;
+  }
+  return RESPONSE_TEMPLATES;
 }
 
+const DEFAULT_RESPONSE_TEMPLATES = {
+  active_v1: [
+    "OUTPUT RULES (ACTIVE ATTEMPT):",
+    "- DO NOT reveal the final answer or full solution.",
+    "- DO NOT use phrases like 'final answer', 'answer is', or show computed results.",
+    "- Ask ONE focused question OR give ONE small hint.",
+    "- Keep it short (max ~80 words).",
+    "- Do not provide step-by-step solution."
+  ],
+  submitted_v1: [
+    "OUTPUT RULES (SUBMITTED):",
+    "- Student has submitted, but this is not review yet.",
+    "- Acknowledge submission briefly.",
+    "- Ask if they want review mode.",
+    "- Do NOT reveal the final answer or full solution."
+  ],
+  review_v1: [
+    "OUTPUT RULES (REVIEW MODE):",
+    "- Student already submitted; provide full solution clearly.",
+    "- Include final answer and explain reasoning.",
+    "- Use steps if helpful.",
+    "- Be crisp and correct."
+  ]
+};
+
 /**
  * Assemble complete prompt for AI interaction
  *
@@ -101,28 +132,19 @@ function assemblePrompt(config) {
   }
 
   // Validate tier
-  const validTiers = ["warmup", "standard", "challenge", "contest", "elite"];
-  if (!validTiers.includes(tier)) {
-    throw new Error(
-      `Invalid tier: ${tier}. Must be one of: ${validTiers.join(", ")}`
-    );
+  if (!VALID_TIERS.has(tier)) {
+    throw new Error(`Invalid tier: ${tier}. Must be one of: ${VALID_TIERS_MSG}`);
   }
 
   // Validate mode
-  const validModes = ["bootcamp", "mixed", "mock"];
-  if (!validModes.includes(mode)) {
-    throw new Error(
-      `Invalid mode: ${mode}. Must be one of: ${validModes.join(", ")}`
-    );
+  if (!VALID_MODES.has(mode)) {
+    throw new Error(`Invalid mode: ${mode}. Must be one of: ${VALID_MODES_MSG}`);
   }
 
   // Validate attempt_state
-  const validStates = ["active", "submitted", "review"];
-  if (!validStates.includes(attempt_state)) {
+  if (!VALID_STATES.has(attempt_state)) {
     throw new Error(
-      `Invalid attempt_state: ${attempt_state}. Must be one of: ${validStates.join(
-        ", "
-      )}`
+      `Invalid attempt_state: ${attempt_state}. Must be one of: ${VALID_STATES_MSG}`
     );
   }
 
@@ -227,7 +249,7 @@ function getGatedHints(tier, mode, attempt_state, hints) {
  * @returns {string} - System prompt text
  */
 function buildSystemPrompt() {
-  return (SYSTEM_PROMPT.content || []).join("\n");
+  return loadPrompts().systemText;
 }
 
 /**
@@ -238,25 +260,21 @@ function buildSystemPrompt() {
  * @returns {Array<string>} - Developer prompt texts
  */
 function buildDeveloperPrompts(tier, mode) {
-  const prompts = [];
+  const prompts = loadPrompts();
 
   // Tier prompt
   const tierPromptKey = `tier_${tier}_v1`;
-  const tierPrompt = TIER_PROMPTS[tierPromptKey];
-  if (!tierPrompt) {
+  if (!prompts.tiers[tierPromptKey]) {
     throw new Error(`Tier prompt not found: ${tierPromptKey}`);
   }
-  prompts.push((tierPrompt.content || []).join("\n"));
 
   // Mode prompt
   const modePromptKey = `mode_${mode}_v1`;
-  const modePrompt = MODE_PROMPTS[modePromptKey];
-  if (!modePrompt) {
+  if (!prompts.modes[modePromptKey]) {
     throw new Error(`Mode prompt not found: ${modePromptKey}`);
   }
-  prompts.push((modePrompt.content || []).join("\n"));
 
-  return prompts;
+  return [prompts.tierText[tierPromptKey], prompts.modeText[modePromptKey]];
 }
 
 /**
@@ -266,19 +284,21 @@ function buildDeveloperPrompts(tier, mode) {
  * @returns {string} - Response template text
  */
 function buildResponseTemplate(attempt_state) {
+  const templates = loadResponseTemplates();
+
   // Prefer state-specific templates if available
-  if (attempt_state === "active" && RESPONSE_TEMPLATES.active_v1) {
-    return RESPONSE_TEMPLATES.active_v1.join("\n");
+  if (attempt_state === "active" && templates.active_v1) {
+    return templates.active_v1.join("\n");
   }
-  if (attempt_state === "submitted" && RESPONSE_TEMPLATES.submitted_v1) {
-    return RESPONSE_TEMPLATES.submitted_v1.join("\n");
+  if (attempt_state === "submitted" && templates.submitted_v1) {
+    return templates.submitted_v1.join("\n");
   }
-  if (attempt_state === "review" && RESPONSE_TEMPLATES.review_v1) {
-    return RESPONSE_TEMPLATES.review_v1.join("\n");
+  if (attempt_state === "review" && templates.review_v1) {
+    return templates.review_v1.join("\n");
   }
 
   // Fallback: safest behavior (no answer) for unknown states
-  const safe = RESPONSE_TEMPLATES.active_v1 || [
+  const safe = templates.active_v1 || [
     "OUTPUT RULES:",
     "- Do not reveal final answer.",
     "- Ask one helpful question."
@@ -304,99 +324,101 @@ function getResponseTemplateVersion(attempt_state) {
  * @returns {string} - Context prompt text
  */
 function buildContextPrompt(problem, studentState, attempt_state, allowedHints) {
-  const context = [];
+  // Each block is either "" or complete lines ending in "\n", so the
+  // template below is the only concatenation.
+  return `PROBLEM CONTEXT:
 
-  context.push("PROBLEM CONTEXT:");
-  context.push("");
+${problemBlock(problem)}${studentBlock(studentState)}${hintsBlock(
+    attempt_state,
+    allowedHints
+  )}${answerBlock(attempt_state, problem)}ATTEMPT STATE: ${attempt_state.toUpperCase()}${attemptStateBlurb(
+    attempt_state
+  )}`;
+}
+
+function problemBlock(problem) {
+  let block = "";
 
   // Problem statement (always included)
   if (problem.statement) {
-    context.push("Problem Statement:");
-    context.push(problem.statement);
-    context.push("");
+    block += `Problem Statement:\n${problem.statement}\n\n`;
   }
 
   // Archetype (internal - don't reveal to student)
   if (problem.archetype) {
-    context.push(`Internal Archetype: ${problem.archetype}`);
-    context.push(
-      "(Use this to guide hint strategy, but do not mention archetype name to student)"
-    );
-    context.push("");
+    block +=
+      `Internal Archetype: ${problem.archetype}\n` +
+      "(Use this to guide hint strategy, but do not mention archetype name to student)\n\n";
   }
 
   // Skill track
   if (problem.skill_track) {
-    context.push(`Skill Track: ${problem.skill_track}`);
-    context.push("");
+    block += `Skill Track: ${problem.skill_track}\n\n`;
   }
 
+  return block;
+}
+
+function studentBlock(studentState) {
   // Student context
-  if (studentState) {
-    context.push("STUDENT CONTEXT:");
-    context.push("");
+  if (!studentState) return "";
 
-    if (studentState.level) {
-      context.push(`Student Level: ${studentState.level}`);
-    }
+  let block = "STUDENT CONTEXT:\n\n";
 
-    if (studentState.age) {
-      context.push(`Age: ${studentState.age} years`);
-    }
+  if (studentState.level) {
+    block += `Student Level: ${studentState.level}\n`;
+  }
 
-    if (studentState.attempts_on_this_archetype !== undefined) {
-      context.push(
-        `Previous attempts on this archetype: ${studentState.attempts_on_this_archetype}`
-      );
-    }
+  if (studentState.age) {
+    block += `Age: ${studentState.age} years\n`;
+  }
 
-    context.push("");
+  if (studentState.attempts_on_this_archetype !== undefined) {
+    block += `Previous attempts on this archetype: ${studentState.attempts_on_this_archetype}\n`;
   }
 
+  return block + "\n";
+}
+
+function hintsBlock(attempt_state, allowedHints) {
   // ✅ Hints during ACTIVE attempt only (already gated)
-  if (attempt_state === "active" && allowedHints.length > 0) {
-    context.push("AVAILABLE HINTS:");
-    context.push("(Use these ONLY when appropriate per tier rules)");
-    allowedHints.forEach((hint, index) => {
-      context.push(`Hint ${index + 1}: ${hint}`);
-    });
-    context.push("");
-  }
+  if (attempt_state !== "active" || allowedHints.length === 0) return "";
+
+  let block =
+    "AVAILABLE HINTS:\n(Use these ONLY when appropriate per tier rules)\n";
+  allowedHints.forEach((hint, index) => {
+    block += `Hint ${index + 1}: ${hint}\n`;
+  });
+  return block + "\n";
+}
 
+function answerBlock(attempt_state, problem) {
   // ✅ Only include answer_key in REVIEW state
-  if (attempt_state === "review" && problem.answer_key) {
-    context.push("ANSWER & SOLUTION (REVIEW MODE):");
-    context.push(
-      "(Student has submitted their attempt. You may now provide full explanation)"
-    );
-    context.push("");
-    context.push(`Correct Answer: ${problem.answer_key}`);
+  if (attempt_state !== "review" || !problem.answer_key) return "";
 
-    if (problem.solution) {
-      context.push("");
-      context.push("Solution Steps:");
-      context.push(problem.solution);
-    }
-    context.push("");
+  let block =
+    "ANSWER & SOLUTION (REVIEW MODE):\n" +
+    "(Student has submitted their attempt. You may now provide full explanation)\n\n" +
+    `Correct Answer: ${problem.answer_key}\n`;
+
+  if (problem.solution) {
+    block += `\nSolution Steps:\n${problem.solution}\n`;
   }
+  return block + "\n";
+}
 
+function attemptStateBlurb(attempt_state) {
   // Attempt state indicator
-  context.push(`ATTEMPT STATE: ${attempt_state.toUpperCase()}`);
   if (attempt_state === "active") {
-    context.push(
-      "(Student is actively working on this problem - follow tier rules strictly)"
-    );
-  } else if (attempt_state === "submitted") {
-    context.push(
-      "(Student has submitted - acknowledge briefly; wait for review mode for full explanation)"
-    );
-  } else if (attempt_state === "review") {
-    context.push(
-      "(Review mode - provide complete explanation with answer and solution)"
-    );
+    return "\n(Student is actively working on this problem - follow tier rules strictly)";
   }
-
-  return context.join("\n");
+  if (attempt_state === "submitted") {
+    return "\n(Student has submitted - acknowledge briefly; wait for review mode for full explanation)";
+  }
+  if (attempt_state === "review") {
+    return "\n(Review mode - provide complete explanation with answer and solution)";
+  }
+  return "";
 }
 
 /**
@@ -746,8 +768,14 @@ module.exports = {
   assembleVisionPrompt,
   validateVisionPromptAssembly,
 
-  // Export prompt objects for direct access if needed
-  SYSTEM_PROMPT,
-  TIER_PROMPTS,
-  MODE_PROMPTS
+  // Export prompt objects for direct access if needed (loaded on first read)
+  get SYSTEM_PROMPT() {
+    return loadPrompts().system;
+  },
+  get TIER_PROMPTS() {
+    return loadPrompts().tiers;
+  },
+  get MODE_PROMPTS() {
+    return loadPrompts().modes;
+  }
 };
\ No newline at end of file
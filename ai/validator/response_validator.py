@@ -2,8 +2,33 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import List, Tuple
 
+# google-re2 is an optional speedup: a DFA engine that matches the whole
+# leak alternation in linear time. It is only used for the folded-ASCII
+# patterns below. RE2's \s is narrower than Python's even on ASCII (no \x0b
+# or \x1c-\x1f), and its \b, \s and case folding are ASCII-only, so anything
+# that can see non-ASCII text stays on stdlib re. The verdict must not depend
+# on which engine is installed.
+try:
+    import re2 as _folded_re
+except ImportError:  # pragma: no cover
+    _folded_re = re
+
+# Python's \s restricted to ASCII, spelled out so RE2 matches it exactly
+ASCII_SPACE_CLASS = r"[\t\n\x0b\x0c\r\x1c-\x1f ]"
+
+
+def _ascii_spaces(pattern: str) -> str:
+    return pattern.replace(r"\s", ASCII_SPACE_CLASS)
+
+# pyahocorasick is an optional speedup for the literal leak phrases.
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover
+    ahocorasick = None
+
 
 # ---------- Rules (simple + effective) ----------
 # ACTIVE should NEVER leak:
@@ -27,6 +52,122 @@ ACTIVE_LEAK_PATTERNS = [
 
 ACTIVE_LEAK_REGEX = re.compile("|".join(ACTIVE_LEAK_PATTERNS), re.IGNORECASE)
 
+# The patterns are all lowercase, so ASCII text folded once with lower() can
+# be matched case-sensitively instead of folding at every regex position.
+ACTIVE_FOLDED_LEAK_REGEX = _folded_re.compile(_ascii_spaces("|".join(ACTIVE_LEAK_PATTERNS)))
+
+# Every leak pattern contains one of these words, so folded text without
+# any of them can skip the leak matchers entirely. Keep in sync with the
+# patterns above.
+ACTIVE_LEAK_ANCHORS = (
+    "answer",
+    "solution",
+    "walkthrough",
+    "step",
+    "therefore",
+    "hence",
+    "proof",
+    "derive",
+)
+
+# Most leak patterns are just \b<literal>\b; only the step ones need \s*.
+ACTIVE_LEAK_PHRASES = [p[2:-2] for p in ACTIVE_LEAK_PATTERNS if "\\s" not in p]
+ACTIVE_FOLDED_STEP_LEAK_REGEX = _folded_re.compile(
+    _ascii_spaces("|".join(p for p in ACTIVE_LEAK_PATTERNS if "\\s" in p))
+)
+
+
+def _build_leak_automaton():
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for phrase in ACTIVE_LEAK_PHRASES:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+
+ACTIVE_LEAK_AUTOMATON = _build_leak_automaton()
+
+# Bullets/numbered steps at the start of a line
+STEPWISE_PATTERN = r"^\s*(?:\d+[\).\]]|-\s+|\*\s+)"
+STEPWISE_REGEX = re.compile(STEPWISE_PATTERN, re.MULTILINE)
+
+# One pass finds the leftmost leak phrase OR stepwise line; the group name
+# tells us which one hit.
+ACTIVE_COMBINED_PATTERN = (
+    f"(?P<leak>{'|'.join(ACTIVE_LEAK_PATTERNS)})|(?P<steps>{STEPWISE_PATTERN})"
+)
+ACTIVE_COMBINED_REGEX = re.compile(
+    ACTIVE_COMBINED_PATTERN, re.IGNORECASE | re.MULTILINE
+)
+ACTIVE_FOLDED_COMBINED_REGEX = _folded_re.compile(
+    "(?m)" + _ascii_spaces(ACTIVE_COMBINED_PATTERN)
+)
+
+# Heuristic: too long often means full solution dump
+ACTIVE_MAX_LEN = 700
+REVIEW_MIN_LEN = 20
+
+KNOWN_TIERS = frozenset({"WARMUP", "STANDARD", "CHALLENGE"})
+KNOWN_MODES = frozenset({"PRACTICE", "BOOTCAMP", "MIXED", "MOCK"})
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _has_literal_leak(folded: str) -> bool:
+    """
+    Aho-Corasick pass over the folded text, then the same \b checks the
+    regex would do at each end of the hit.
+    """
+    n = len(folded)
+    for end, phrase in ACTIVE_LEAK_AUTOMATON.iter(folded):
+        start = end - len(phrase) + 1
+        before = start > 0 and _is_word_char(folded[start - 1])
+        after = end + 1 < n and _is_word_char(folded[end + 1])
+        if before != _is_word_char(phrase[0]) and after != _is_word_char(phrase[-1]):
+            return True
+    return False
+
+
+def _scan_combined(combined, leak_regex, text: str) -> Tuple[bool, bool]:
+    """
+    Nothing of the other kind can start before the leftmost combined match,
+    so the follow-up search resumes from there instead of rescanning.
+    """
+    m = combined.search(text)
+    if m is None:
+        return False, False
+    if m.lastgroup == "leak":
+        return True, STEPWISE_REGEX.search(text, m.start()) is not None
+    return leak_regex.search(text, m.start()) is not None, True
+
+
+def _scan_active(text: str) -> Tuple[bool, bool]:
+    """
+    Returns (has_leak_language, has_stepwise_formatting).
+    """
+    if not text.isascii():
+        # IGNORECASE also folds Unicode look-alikes (e.g. "ſ") that lower()
+        # leaves alone, and lower() can change the length of non-ASCII text.
+        return _scan_combined(ACTIVE_COMBINED_REGEX, ACTIVE_LEAK_REGEX, text)
+
+    # ASCII: fold once, then every matcher runs case-sensitively
+    folded = text.lower()
+    if not any(anchor in folded for anchor in ACTIVE_LEAK_ANCHORS):
+        return False, STEPWISE_REGEX.search(folded) is not None
+
+    if ACTIVE_LEAK_AUTOMATON is not None:
+        leak = (
+            _has_literal_leak(folded)
+            or ACTIVE_FOLDED_STEP_LEAK_REGEX.search(folded) is not None
+        )
+        return leak, STEPWISE_REGEX.search(folded) is not None
+
+    return _scan_combined(ACTIVE_FOLDED_COMBINED_REGEX, ACTIVE_FOLDED_LEAK_REGEX, folded)
+
 
 def validate_ai_output(
     *,
@@ -48,39 +189,62 @@ def validate_ai_output(
     mode_norm = (mode or "").strip().upper()
     text = (ai_output or "").strip()
 
+    # Over-long outputs never reach the scanners, so caching them would only
+    # pin whole AI responses in memory to save a length check.
+    if len(text) > ACTIVE_MAX_LEN:
+        validator_pass, reasons = _validate_normalized(tier, state, mode_norm, text)
+    else:
+        validator_pass, reasons = _validate_ai_output_cached(tier, state, mode_norm, text)
+    return validator_pass, list(reasons)
+
+
+def _validate_normalized(
+    tier: str, state: str, mode_norm: str, text: str
+) -> Tuple[bool, Tuple[str, ...]]:
+    """
+    Pure on its normalized inputs. Reasons come back as a tuple so cached
+    results can't be mutated by callers.
+    """
     reasons: List[str] = []
+    n = len(text)
 
     # Basic sanity
-    if not text:
+    if not n:
         reasons.append("empty_output")
 
-    # ACTIVE: strict
+    # ACTIVE: strict. Length is decided first so the scanners only ever see
+    # bounded, non-empty input.
     if state == "ACTIVE":
-        if ACTIVE_LEAK_REGEX.search(text):
-            reasons.append("active_leak_solution_or_answer_language")
-
-        # Heuristic: too long often means full solution dump
-        if len(text) > 700:
+        if n > ACTIVE_MAX_LEN:
+            # Already failing; don't scan a full solution dump for leak words
             reasons.append("active_too_long_possible_full_solution")
+        elif n:
+            leak, stepwise = _scan_active(text)
+            if leak:
+                reasons.append("active_leak_solution_or_answer_language")
 
-        # Heuristic: looks like multi-step solution formatting
-        if re.search(r"(?m)^\s*(\d+[\).\]]|-\s+|\*\s+)", text):
             # Bullets/numbered steps in ACTIVE is suspicious
-            reasons.append("active_stepwise_formatting")
+            if stepwise:
+                reasons.append("active_stepwise_formatting")
 
     # REVIEW: allow full solutions; but still must be meaningful
     if state == "REVIEW":
-        if len(text) < 20:
+        if n < REVIEW_MIN_LEN:
             reasons.append("review_too_short")
 
     # Optional: validate allowed values (non-fatal, but helpful)
-    if tier not in {"WARMUP", "STANDARD", "CHALLENGE"}:
+    if tier not in KNOWN_TIERS:
         # Don’t fail the user for tier mismatch; just add reason for debugging
         reasons.append(f"unknown_tier:{tier}")
 
-    if mode_norm not in {"PRACTICE", "BOOTCAMP", "MIXED", "MOCK"}:
+    if mode_norm not in KNOWN_MODES:
         reasons.append(f"unknown_mode:{mode_norm}")
 
     validator_pass = len([r for r in reasons if not r.startswith("unknown_")]) == 0
     # unknown_* are warnings, not failures
-    return validator_pass, reasons
+    return validator_pass, tuple(reasons)
+
+
+# Batch runs with repeated outputs skip the scans; only bounded texts
+# (<= ACTIVE_MAX_LEN) are ever passed in, so entry size is capped too.
+_validate_ai_output_cached = lru_cache(maxsize=65536)(_validate_normalized)